@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
+import argparse
 import curses
+import functools
 import logging
 import math
+import os
+import numpy as np
 import plotly.graph_objects as go
-import sys
-import random
+import queue
+import threading
 
 LOG_FILENAME = "layer_axiom_game.log"
 OUTPUT_FILENAME = "matrix_visualization.html"
@@ -39,21 +43,58 @@ AXIOM_CONFIGS = {
     'J': {'color': 'black',  'label': 'J (Diagonal plane -Y3)', 'opacity': 1},
 }
 
+# Points are colored by their axiom's index in AXIOM_CONFIGS through
+# this colorscale: plotly validates one number per point far faster
+# than one color name per point
+AXIOM_INDEX = {axiom: i for (i, axiom) in enumerate(AXIOM_CONFIGS)}
+AXIOM_COLORSCALE = [[i / (len(AXIOM_CONFIGS) - 1), config['color']]
+                    for (i, config) in enumerate(AXIOM_CONFIGS.values())]
+# axiom index => label, shown on hover next to the cell's char
+AXIOM_LABELS = np.array([config['label'] for config in AXIOM_CONFIGS.values()])
+
 LAYER0_OPACITY = 1
 LAYER1_OPACITY = 1
 
+# Level of detail: rings on layers >= LOD_THRESHOLD are subsampled to
+# roughly MAX_RING_POINTS points so deep stacks stay light in the browser.
+LOD_THRESHOLD = 2
+MAX_RING_POINTS = 256
+
+# HTML export: plotly.js is loaded from the CDN instead of being
+# embedded, which keeps the file small and quick to (re)open.
+HTML_EXPORT_OPTIONS = dict(
+    include_plotlyjs='cdn',
+    full_html=True,
+    auto_open=False,
+    config={'responsive': True, 'scrollZoom': True},
+)
+
 # These can be overridden via CLI:
 PREFILL = False
 FILL_MODE = "full"  # "full", "partial", or "random"
 SHAPE = "circle"    # "circle", "square", "polygon:N"
 
-# Holds each layer’s data; keys: (layer, axiom) => (grid, read_only)
-data = {}
+# Holds each layer’s data: data[axiom][layer] => (grid, read_only),
+# None for a layer that has not been created
+data = {axiom: [] for axiom in AXIOM_CONFIGS}
+
+# Set whenever `data` changes; run() then queues a background re-render.
+# At most one request waits in the queue: it renders the latest state
+# anyway, so bursts of edits collapse into a single render.
+_dirty = True
+_render_requests = queue.Queue(maxsize=1)
+_STOP_RENDERING = object()
+# Seconds without new edits before the background render starts
+RENDER_DEBOUNCE = 0.3
+# Hash of the state behind the last written HTML, to skip identical re-renders
+_last_render_hash = None
 
 # Current “game state” for curses
 current_layer = 0
 current_axiom = 'A'
 cursor_x, cursor_y = 0, 0
+# (dx, dy) => where the cursor lands from each cell; see _build_jump_tables
+_jump_tables = {}
 
 # Example default fill patterns (each is a list of strings):
 FILLS = {
@@ -76,235 +117,323 @@ def layer_dimension(layer):
 
 def create_layer_axiom(layer, axiom):
     dim = layer_dimension(layer)
-    grid = [[DEFAULT_CHAR for _ in range(dim)] for _ in range(dim)]
-    read_only = [[False for _ in range(dim)] for _ in range(dim)]
+    grid = np.full((dim, dim), DEFAULT_CHAR, dtype='<U1')
+    read_only = np.zeros((dim, dim), dtype=bool)
 
     if layer == 0:
-        grid[0][0] = CENTER_CHAR
-        read_only[0][0] = False
+        grid[0, 0] = CENTER_CHAR
+        read_only[0, 0] = False
     else:
-        # Inherit data from the previous layer
-        ensure_layer_axiom(layer - 1, axiom)
-        prev_grid, prev_read_only = data[(layer - 1, axiom)]
-        prev_dim = layer_dimension(layer - 1)
+        # Inherit data from the previous layer; ensure_layer_axiom
+        # builds layers bottom-up, so it already exists
+        prev_grid, prev_read_only = data[axiom][layer - 1]
+        prev_dim = prev_grid.shape[0]
         offset = (dim - prev_dim) // 2
+        inner = (slice(offset, offset + prev_dim), slice(offset, offset + prev_dim))
+
+        # If it's the center char, replace with space
+        grid[inner] = np.where(prev_grid == CENTER_CHAR, ' ', prev_grid)
+        read_only[inner] = True
+
+    _store_layer_axiom(layer, axiom, grid, read_only)
 
-        for py in range(prev_dim):
-            for px in range(prev_dim):
-                ch = prev_grid[py][px]
-                # If it's the center char, replace with space
-                if ch == CENTER_CHAR:
-                    ch = ' '
-                grid[py + offset][px + offset] = ch
-                read_only[py + offset][px + offset] = True
+def _store_layer_axiom(layer, axiom, grid, read_only):
+    layers = data.setdefault(axiom, [])
+    if len(layers) <= layer:
+        layers.extend([None] * (layer + 1 - len(layers)))
+    layers[layer] = (grid, read_only)
 
-    data[(layer, axiom)] = (grid, read_only)
+def has_layer_axiom(layer, axiom):
+    layers = data.get(axiom, ())
+    return layer < len(layers) and layers[layer] is not None
+
+def iter_layer_axioms():
+    """
+    Yield (layer, axiom, grid, read_only) for every existing entry.
+    Iterates over a snapshot, so the UI thread may add layers meanwhile.
+    """
+    for axiom, layers in list(data.items()):
+        for layer, entry in enumerate(list(layers)):
+            if entry is None:
+                continue
+            yield (layer, axiom) + entry
 
 def ensure_layer_axiom(layer, axiom):
-    if (layer, axiom) not in data:
-        create_layer_axiom(layer, axiom)
+    """
+    Create (layer, axiom) if missing, along with any missing layers
+    below it, iteratively from the lowest missing one upwards.
+    """
+    global _dirty
+    if has_layer_axiom(layer, axiom):
+        return
+    first_missing = layer
+    while first_missing > 0 and not has_layer_axiom(first_missing - 1, axiom):
+        first_missing -= 1
+    for missing in range(first_missing, layer + 1):
+        create_layer_axiom(missing, axiom)
+    _dirty = True
+
+@functools.lru_cache(maxsize=None)
+def _ring_coords(N):
+    """
+    Return (xs, ys) for the ring max(|x|,|y|) == N, walked clockwise
+    on screen from the top-left corner: top edge left to right, right
+    edge downwards, bottom edge right to left, left edge upwards
+    (the same edge order as the square perimeter path).
+    Shared by every axiom, so it is computed once per N.
+    """
+    if N == 0:
+        xs = ys = np.zeros(1, dtype=np.int64)
+    else:
+        up = np.arange(-N, N)        # -N .. N-1
+        down = np.arange(N, -N, -1)  # N .. -N+1
+        xs = np.concatenate((up, np.full(2 * N, N), down, np.full(2 * N, -N)))
+        ys = np.concatenate((np.full(2 * N, -N), up, np.full(2 * N, N), down))
+    for arr in (xs, ys):
+        arr.setflags(write=False)
+    return xs, ys
+
+@functools.lru_cache(maxsize=None)
+def _ring_flat_indices(N):
+    """
+    The ring of layer N as flat (row-major) indices into its grid,
+    in the same order as _ring_coords(N).
+    """
+    xs, ys = _ring_coords(N)
+    flat = (ys + N) * layer_dimension(N) + (xs + N)
+    flat.setflags(write=False)
+    return flat
 
 def get_outer_ring_cells(layer, axiom):
     """
-    Return all non-empty (x,y,ch) in the outer ring,
-    skipping ' ', '', or DEFAULT_CHAR.
+    Return (coords, chars) for all non-empty cells in the outer ring,
+    in perimeter order, skipping ' ', '', or DEFAULT_CHAR.
+    coords is a (k, 2) array of (x, y); chars the matching '<U1' array.
     """
-    grid, ro = data[(layer, axiom)]
-    dim = layer_dimension(layer)
-    center = layer
+    grid, ro = data[axiom][layer]
     if layer == 0:
-        ch = grid[0][0]
-        return [(0, 0, ch)]
-    ring = []
-    N = layer
-    for y in range(-N, N + 1):
-        for x in range(-N, N + 1):
-            if max(abs(x), abs(y)) == N:
-                gx = x + center
-                gy = y + center
-                ch = grid[gy][gx]
-                # skip if it's default or blank
-                if ch in [' ', '', DEFAULT_CHAR]:
-                    continue
-                ring.append((x, y, ch))
-    return ring
+        return np.zeros((1, 2), dtype=np.int64), grid[0, :1].copy()
+    xs, ys = _ring_coords(layer)
+    chars = grid.ravel()[_ring_flat_indices(layer)]
+    # skip if it's default or blank; '<U1' cells are UCS-4 code
+    # points, with '' stored as 0
+    codes = chars.view(np.uint32)
+    keep = (codes != 0) & (codes != ord(' ')) & (codes != ord(DEFAULT_CHAR))
+    return np.stack((xs[keep], ys[keep]), axis=1), chars[keep]
 
 # ---------------------------------------------------------------------
 # 2) 3D RENDERING
 # ---------------------------------------------------------------------
-def perimeter_2d(shape, layer, fraction):
+_TWO_PI = 2 * math.pi
+SQRT2_OVER_2 = math.sqrt(2) / 2
+
+@functools.lru_cache(maxsize=128)
+def _angle_table(n):
+    """
+    (cos, sin) of the n evenly spaced angles 2*pi*i/n.
+    Every axiom's ring of the same size reuses the same table.
+    """
+    theta = _TWO_PI * (np.arange(n) / n)
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    for arr in (cos_t, sin_t):
+        arr.setflags(write=False)
+    return cos_t, sin_t
+
+@functools.lru_cache(maxsize=1024)
+def perimeter_2d(shape, layer, n):
+    """
+    Read-only (xs, ys) of the given shape's perimeter path, cached
+    per (shape, layer, n): all nine axioms project the same path.
+    """
+    path = _perimeter_points(shape, layer, n)
+    for arr in path:
+        arr.setflags(write=False)
+    return path
+
+def _perimeter_points(shape, layer, n):
+    """
+    Place n evenly spaced points (fractions i/n) on the given
+    shape's perimeter. Returns (xs, ys) arrays.
+    """
+    t = np.arange(n) / n
     if layer == 0:
-        return (0, 0)
+        return (np.zeros_like(t), np.zeros_like(t))
     if shape == "circle":
         r = layer
-        theta = 2 * math.pi * fraction
-        return (r * math.cos(theta), r * math.sin(theta))
+        cos_t, sin_t = _angle_table(n)
+        return (r * cos_t, r * sin_t)
     elif shape == "square":
         side = 2 * layer
-        t = fraction % 1.0
-        if t < 0.25:
-            local = (t - 0.0) / 0.25
-            return (-layer + local*side, layer)
-        elif t < 0.5:
-            local = (t - 0.25) / 0.25
-            return (layer, layer - local*side)
-        elif t < 0.75:
-            local = (t - 0.5) / 0.25
-            return (layer - local*side, -layer)
-        else:
-            local = (t - 0.75) / 0.25
-            return (-layer, -layer + local*side)
+        # which edge each point is on (top, right, bottom, left)
+        # and how far along it, straight from 4*t
+        edge = (t * 4).astype(int)
+        local = t * 4 - edge
+        xs = np.choose(edge, [-layer + local*side, np.full_like(t, layer),
+                              layer - local*side, np.full_like(t, -layer)])
+        ys = np.choose(edge, [np.full_like(t, layer), layer - local*side,
+                              np.full_like(t, -layer), -layer + local*side])
+        return (xs, ys)
     elif shape.startswith("polygon:"):
         # parse sides, fallback 6 if invalid
         N_str = shape.split(":", 1)[1]
         N = int(N_str) if N_str.isdigit() else 6
-        total = fraction * N
-        edge_index = int(math.floor(total))
+        total = t * N
+        edge_index = np.floor(total)
         edge_fraction = total - edge_index
-        angle1 = 2 * math.pi * edge_index / N
-        angle2 = 2 * math.pi * ((edge_index + 1) % N) / N
+        # polygon vertices come from the cached table, no trig per point
+        vertex_cos, vertex_sin = _angle_table(N)
+        i1 = edge_index.astype(int)
+        i2 = (i1 + 1) % N
         r = layer
-        x1, y1 = (r * math.cos(angle1), r * math.sin(angle1))
-        x2, y2 = (r * math.cos(angle2), r * math.sin(angle2))
+        x1, y1 = (r * vertex_cos[i1], r * vertex_sin[i1])
+        x2, y2 = (r * vertex_cos[i2], r * vertex_sin[i2])
         return (x1 + (x2 - x1) * edge_fraction,
                 y1 + (y2 - y1) * edge_fraction)
     else:
         # fallback
-        return (0, 0)
-
-def calculate_coordinates(axiom, shape, layer, fraction):
-    x2d, y2d = perimeter_2d(shape, layer, fraction)
-    if axiom == 'A':  # XY plane
-        return (x2d, y2d, 0)
-    elif axiom == 'B':  # YZ plane
-        return (0, x2d, y2d)
-    elif axiom == 'C':  # XZ plane
-        return (x2d, 0, y2d)
-    elif axiom == 'D':
-        factor = math.sqrt(2) / 2
-        return (x2d, y2d*factor, y2d*factor)
-    elif axiom == 'E':
-        factor = math.sqrt(2) / 2
-        return (y2d*factor, x2d, y2d*factor)
-    elif axiom == 'F':
-        factor = math.sqrt(2) / 2
-        return (y2d*factor, y2d*factor, x2d)
-    elif axiom == 'H':
-        factor = math.sqrt(2) / 2
-        return (x2d, y2d*factor, -y2d*factor)
-    elif axiom == 'I':
-        factor = math.sqrt(2) / 2
-        return (-y2d*factor, x2d, y2d*factor)
-    elif axiom == 'J':
-        factor = math.sqrt(2) / 2
-        return (-y2d*factor, y2d*factor, x2d)
-    return (0, 0, 0)
-
-def render_3d(filename=OUTPUT_FILENAME):
-    """
-    Create a 3D scatter trace for each layer & axiom’s ring,
-    then write it to HTML.
-    """
-    layer_0_trace = {axiom: {'x': [], 'y': [], 'z': [], 'text': []} for axiom in AXIOM_CONFIGS}
-    layer_1_trace = {axiom: {'x': [], 'y': [], 'z': [], 'text': []} for axiom in AXIOM_CONFIGS}
-    layer_1_plus_traces = []
-
-    if not data:
-        fig = go.Figure()
-        fig.write_html(filename)
-        print(f"Visualization saved to {filename}. (no data yet)")
+        return (np.zeros_like(t), np.zeros_like(t))
+
+# axiom => (3, 2) matrix mapping (x2d, y2d) to (x, y, z); the
+# diagonal planes have the SQRT2_OVER_2 factor baked in
+_f = SQRT2_OVER_2
+AXIOM_PROJECTIONS = {
+    'A': [[1, 0], [0, 1], [0, 0]],     # XY plane
+    'B': [[0, 0], [1, 0], [0, 1]],     # YZ plane
+    'C': [[1, 0], [0, 0], [0, 1]],     # XZ plane
+    'D': [[1, 0], [0, _f], [0, _f]],
+    'E': [[0, _f], [1, 0], [0, _f]],
+    'F': [[0, _f], [0, _f], [1, 0]],
+    'H': [[1, 0], [0, _f], [0, -_f]],
+    'I': [[0, -_f], [1, 0], [0, _f]],
+    'J': [[0, -_f], [0, _f], [1, 0]],
+}
+AXIOM_PROJECTIONS = {axiom: np.array(m, dtype=float) for (axiom, m) in AXIOM_PROJECTIONS.items()}
+del _f
+
+def calculate_coordinates(axiom, shape, layer, n):
+    """
+    Vectorized: project the n points of a ring into 3D
+    for the given axiom. Returns a (3, n) array of x, y, z rows.
+    """
+    x2d, y2d = perimeter_2d(shape, layer, n)
+    proj = AXIOM_PROJECTIONS.get(axiom)
+    if proj is None:
+        return np.zeros((3, n))
+    return proj @ np.stack((x2d, y2d))
+
+# layer group => (marker size, legend name)
+LAYER_GROUP_STYLES = {
+    'layer_0': (10, "Layer 0"),
+    'layer_1': (8, "Layer 1"),
+    'layer_1_plus': (5, "Layers 2+"),
+}
+
+def _write_html_atomically(fig, filename):
+    """
+    Write to a temporary file and swap it in, so a browser reloading
+    the page never sees a half-written file.
+    """
+    tmp_filename = filename + ".tmp"
+    fig.write_html(tmp_filename, **HTML_EXPORT_OPTIONS)
+    os.replace(tmp_filename, filename)
+
+def render_3d(filename=OUTPUT_FILENAME, verbose=True):
+    """
+    Build one 3D scatter trace per layer group (0, 1, 2+), holding
+    every axiom's ring with per-point colors, then write it to HTML.
+    Skipped when nothing changed since the last write.
+    """
+    global _last_render_hash
+
+    entries = list(iter_layer_axioms())
+    state_hash = hash((filename, SHAPE,
+                       tuple((layer, axiom, grid.tobytes()) for (layer, axiom, grid, _) in entries)))
+    if state_hash == _last_render_hash and os.path.exists(filename):
+        if verbose:
+            print(f"Visualization {filename} is already up to date.")
         return
 
-    max_layer = max(layer for (layer, _) in data.keys())
+    if not entries:
+        fig = go.Figure()
+        _write_html_atomically(fig, filename)
+        _last_render_hash = state_hash
+        if verbose:
+            print(f"Visualization saved to {filename}. (no data yet)")
+        return
 
-    for (layer, axiom) in data.keys():
-        ring_cells = get_outer_ring_cells(layer, axiom)
-        if not ring_cells:
-            continue
+    max_layer = max(layer for (layer, *_) in entries)
 
-        # sort ring points by angle
-        ring_cells.sort(key=lambda c: math.atan2(c[1], c[0]))
-        x_vals, y_vals, z_vals, text_vals = [], [], [], []
-
-        for i, (ox, oy, ch) in enumerate(ring_cells):
-            fraction = i / len(ring_cells)
-            x, y, z = calculate_coordinates(axiom, SHAPE, layer, fraction)
-            x_vals.append(x)
-            y_vals.append(y)
-            z_vals.append(z)
-            text_vals.append(ch)
-
-        if len(x_vals) > 1:
-            # close the loop visually
-            x_vals.append(x_vals[0])
-            y_vals.append(y_vals[0])
-            z_vals.append(z_vals[0])
-            text_vals.append(text_vals[0])
+    # (layer group, opacity) => per-ring chunks, concatenated once per
+    # trace below; opacity is per trace, so layers 2+ are only split
+    # further if axioms differ in opacity
+    groups = {}
 
+    for (layer, axiom, _, _) in entries:
+        config = AXIOM_CONFIGS[axiom]
+        # layers 0/1 take their opacity from LAYER0/1_OPACITY, not the axiom
         if layer == 0:
-            layer_0_trace[axiom]['x'].extend(x_vals)
-            layer_0_trace[axiom]['y'].extend(y_vals)
-            layer_0_trace[axiom]['z'].extend(z_vals)
-            layer_0_trace[axiom]['text'].extend(text_vals)
+            key = ('layer_0', LAYER0_OPACITY)
         elif layer == 1:
-            layer_1_trace[axiom]['x'].extend(x_vals)
-            layer_1_trace[axiom]['y'].extend(y_vals)
-            layer_1_trace[axiom]['z'].extend(z_vals)
-            layer_1_trace[axiom]['text'].extend(text_vals)
+            key = ('layer_1', LAYER1_OPACITY)
         else:
-            layer_1_plus_traces.append({
-                'axiom': axiom,
-                'layer': layer,
-                'x': x_vals,
-                'y': y_vals,
-                'z': z_vals,
-                'text': text_vals
-            })
+            key = ('layer_1_plus', config['opacity'])
+        if key[1] == 0:
+            # fully transparent: don't build or ship points nobody sees
+            continue
+
+        # ring points come back in perimeter order, like the 2D path
+        _, ring_chars = get_outer_ring_cells(layer, axiom)
+        if ring_chars.size == 0:
+            continue
+
+        if layer >= LOD_THRESHOLD:
+            stride = max(1, ring_chars.size // MAX_RING_POINTS)
+            ring_chars = ring_chars[::stride]
+
+        n = ring_chars.size
+        points = calculate_coordinates(axiom, SHAPE, layer, n)
+
+        # close the loop visually, then end with a NaN point so Plotly
+        # breaks the line before the next ring of the same trace
+        order = list(range(n)) + ([0] if n > 1 else [])
+        xyz = np.full((3, len(order) + 1), np.nan)
+        xyz[:, :-1] = points[:, order]
+        text = np.append(ring_chars[order], '')
+        color = np.full(text.size, AXIOM_INDEX[axiom])
+
+        group = groups.setdefault(key, {'xyz': [], 'text': [], 'color': []})
+        group['xyz'].append(xyz)
+        group['text'].append(text)
+        group['color'].append(color)
 
     fig = go.Figure()
 
-    # layer_0
-    for ax, config in AXIOM_CONFIGS.items():
-        x_ = layer_0_trace[ax]['x']
-        if x_:
-            fig.add_trace(go.Scatter3d(
-                x=x_,
-                y=layer_0_trace[ax]['y'],
-                z=layer_0_trace[ax]['z'],
-                mode=LAYER_VISUALIZATION_MODES['layer_0'],
-                text=layer_0_trace[ax]['text'],
-                marker=dict(size=10, color=config['color'], symbol='circle'),
-                opacity=LAYER0_OPACITY,
-                name=f"Layer 0 - {config['label']}"
-            ))
-
-    # layer_1
-    for ax, config in AXIOM_CONFIGS.items():
-        x_ = layer_1_trace[ax]['x']
-        if x_:
-            fig.add_trace(go.Scatter3d(
-                x=x_,
-                y=layer_1_trace[ax]['y'],
-                z=layer_1_trace[ax]['z'],
-                mode=LAYER_VISUALIZATION_MODES['layer_1'],
-                text=layer_1_trace[ax]['text'],
-                marker=dict(size=8, color=config['color'], symbol='circle'),
-                opacity=LAYER1_OPACITY,
-                name=f"Layer 1 - {config['label']}"
-            ))
-
-    # layers 2+
-    for trace in layer_1_plus_traces:
-        config = AXIOM_CONFIGS[trace['axiom']]
+    # layer groups split into several traces by opacity
+    split_groups = {group_name for (group_name, opacity) in groups
+                    if sum(name == group_name for (name, _) in groups) > 1}
+
+    for (group_name, opacity), group in sorted(groups.items()):
+        size, name = LAYER_GROUP_STYLES[group_name]
+        if group_name in split_groups:
+            name = f"{name} (opacity {opacity})"
+        # drop the trailing NaN separator of the last ring
+        x, y, z = np.concatenate(group['xyz'], axis=1)[:, :-1]
+        text = np.concatenate(group['text'])[:-1]
+        axiom_index = np.concatenate(group['color'])[:-1]
+        colors = dict(color=axiom_index, colorscale=AXIOM_COLORSCALE,
+                      cmin=0, cmax=len(AXIOM_CONFIGS) - 1)
         fig.add_trace(go.Scatter3d(
-            x=trace['x'],
-            y=trace['y'],
-            z=trace['z'],
-            mode=LAYER_VISUALIZATION_MODES['layer_1_plus'],
-            text=trace['text'],
-            marker=dict(size=5, color=config['color'], symbol='circle'),
-            opacity=config['opacity'],
-            name=f"Layer {trace['layer']} - {config['label']}"
+            x=x,
+            y=y,
+            z=z,
+            mode=LAYER_VISUALIZATION_MODES[group_name],
+            text=text,
+            customdata=AXIOM_LABELS[axiom_index],
+            hovertemplate="%{customdata}: %{text}<br>(%{x}, %{y}, %{z})<extra>%{fullData.name}</extra>",
+            marker=dict(size=size, symbol='circle', **colors),
+            line=colors,
+            opacity=opacity,
+            name=name
         ))
 
     fig.update_layout(
@@ -312,55 +441,105 @@ def render_3d(filename=OUTPUT_FILENAME):
             xaxis=dict(title="X", range=[-max_layer, max_layer]),
             yaxis=dict(title="Y", range=[-max_layer, max_layer]),
             zaxis=dict(title="Z", range=[-max_layer, max_layer]),
+            # keep true proportions instead of re-fitting a cube each render
+            aspectmode='data',
         ),
         title=f"3D Visualization ({SHAPE})",
         width=1000, height=800
     )
-    fig.write_html(filename)
-    print(f"Visualization saved to {filename}.")
+    _write_html_atomically(fig, filename)
+    _last_render_hash = state_hash
+    if verbose:
+        print(f"Visualization saved to {filename}.")
+
+def _render_worker():
+    """
+    Background thread: re-render the HTML for every queued request,
+    so the curses loop never blocks on Plotly.
+    """
+    while True:
+        request = _render_requests.get()
+        # debounce: while edits keep coming, wait for them to settle
+        # instead of writing the HTML once per keystroke
+        while request is not _STOP_RENDERING:
+            try:
+                request = _render_requests.get(timeout=RENDER_DEBOUNCE)
+            except queue.Empty:
+                break
+        if request is _STOP_RENDERING:
+            return
+        try:
+            render_3d(verbose=False)
+        except Exception:
+            logger.exception("Background render failed")
 
 # ---------------------------------------------------------------------
 # 3) CURSOR / KEYBOARD HANDLERS
 # ---------------------------------------------------------------------
-def is_within_bounds(x, y):
-    return (-current_layer <= x <= current_layer and -current_layer <= y <= current_layer)
-
-def is_read_only(x, y):
-    grid, ro = data[(current_layer, current_axiom)]
-    center = current_layer
-    gx = x + center
-    gy = y + center
-    return ro[gy][gx]
+def _next_writable(read_only):
+    """
+    For each cell, the column of the next writable cell to its
+    right in the same row, or -1 if there is none.
+    """
+    rows, cols = read_only.shape
+    table = np.empty((rows, cols), dtype=np.intp)
+    ahead = np.full(rows, -1, dtype=np.intp)
+    for col in range(cols - 1, -1, -1):
+        table[:, col] = ahead
+        ahead = np.where(read_only[:, col], ahead, col)
+    return table
+
+def _build_jump_tables(read_only):
+    """
+    (dx, dy) => (dim, dim) table of the grid column (horizontal moves)
+    or row (vertical moves) the cursor jumps to from each cell,
+    skipping read-only cells; -1 where it would leave the grid.
+    """
+    def backwards(ro):
+        table = _next_writable(ro[:, ::-1])[:, ::-1]
+        return np.where(table >= 0, ro.shape[1] - 1 - table, -1)
+    return {
+        (1, 0): _next_writable(read_only),
+        (-1, 0): backwards(read_only),
+        (0, 1): _next_writable(read_only.T).T,
+        (0, -1): backwards(read_only.T).T,
+    }
 
 def jump_across(dx, dy):
     global cursor_x, cursor_y
-    x, y = cursor_x, cursor_y
-    while True:
-        nx, ny = x + dx, y + dy
-        if not is_within_bounds(nx, ny):
-            return False
-        if not is_read_only(nx, ny):
-            cursor_x, cursor_y = nx, ny
-            return True
-        x, y = nx, ny
+    center = current_layer
+    target = _jump_tables[(dx, dy)][cursor_y + center, cursor_x + center]
+    if target < 0:
+        return False
+    if dx:
+        cursor_x = int(target) - center
+    else:
+        cursor_y = int(target) - center
+    return True
 
 def move_cursor(dx, dy):
     jump_across(dx, dy)
 
 def insert_char(ch):
-    grid, read_only = data[(current_layer, current_axiom)]
+    global _dirty
+    grid, read_only = data[current_axiom][current_layer]
     center = current_layer
     gx = cursor_x + center
     gy = cursor_y + center
-    if not read_only[gy][gx]:
-        grid[gy][gx] = ch
+    if not read_only[gy, gx]:
+        grid[gy, gx] = ch
+        _dirty = True
 
 def go_to_layer_axiom(layer, axiom):
-    global current_layer, current_axiom, cursor_x, cursor_y
+    global current_layer, current_axiom, cursor_x, cursor_y, _jump_tables
     current_layer = layer
     current_axiom = axiom
     ensure_layer_axiom(current_layer, current_axiom)
     cursor_x, cursor_y = -current_layer, -current_layer
+    # read-only masks are fixed once a layer exists, so cursor jumps
+    # are looked up instead of walked cell by cell
+    _, read_only = data[current_axiom][current_layer]
+    _jump_tables = _build_jump_tables(read_only)
 
 def draw_interface(stdscr):
     stdscr.clear()
@@ -369,8 +548,7 @@ def draw_interface(stdscr):
     stdscr.addstr(2, 0, "Ctrl+D=exit, then check the .html. Prefill vs load is handled by arguments.")
     stdscr.addstr(3, 0, f"Press SHIFT or others for chars. Current fill_mode={FILL_MODE}.")
 
-    grid, read_only = data[(current_layer, current_axiom)]
-    dim = layer_dimension(current_layer)
+    grid, read_only = data[current_axiom][current_layer]
     center = current_layer
 
     VIEW_RADIUS = 5
@@ -382,25 +560,20 @@ def draw_interface(stdscr):
     offset_line = 5
     offset_col = 2
 
-    for draw_y in range(min_yv, max_yv + 1):
-        row_chars = []
-        gy = draw_y + center
-        for draw_x in range(min_xv, max_xv + 1):
-            gx = draw_x + center
-            ch = grid[gy][gx]
-            display_char = ' ' if read_only[gy][gx] else ch
-
-            if draw_x == cursor_x and draw_y == cursor_y:
-                # highlight cursor
-                if current_layer == 0 and current_axiom == 'A' and cursor_x == 0 and cursor_y == 0:
-                    char = display_char
-                else:
-                    char = "▮" if display_char != DEFAULT_CHAR else "○"
-            else:
-                char = display_char
-            row_chars.append(char)
-        row_str = "".join(row_chars)
-        stdscr.addstr(offset_line + (draw_y - min_yv), offset_col, row_str)
+    window = (slice(min_yv + center, max_yv + 1 + center),
+              slice(min_xv + center, max_xv + 1 + center))
+    disp = np.where(read_only[window], ' ', grid[window])
+
+    # highlight cursor
+    if not (current_layer == 0 and current_axiom == 'A' and cursor_x == 0 and cursor_y == 0):
+        cy, cx = cursor_y - min_yv, cursor_x - min_xv
+        disp[cy, cx] = "▮" if disp[cy, cx] != DEFAULT_CHAR else "○"
+
+    # decode the whole window once ('<U1' is UCS-4), then slice rows
+    width = disp.shape[1]
+    text = disp.tobytes().decode('utf-32-le')
+    for i in range(disp.shape[0]):
+        stdscr.addnstr(offset_line + i, offset_col, text[i * width:(i + 1) * width], width)
 
     stdscr.refresh()
 
@@ -416,7 +589,7 @@ def prefill_layers(mode, fillA, fillB, fillC, fillD, fillE, fillF, fillH, fillI,
     max_layers = max(len(fillA), len(fillB), len(fillC),
                      len(fillD), len(fillE), len(fillF),
                      len(fillH), len(fillI), len(fillJ))
-    random.seed(0)
+    rng = np.random.default_rng(0)
 
     axioms = ['A','B','C','D','E','F','H','I','J']
     fill_dict = {
@@ -426,23 +599,18 @@ def prefill_layers(mode, fillA, fillB, fillC, fillD, fillE, fillF, fillH, fillI,
     }
 
     for layer in range(1, max_layers + 1):
+        # ring cells of this layer, shared by every axiom
+        ring = _ring_flat_indices(layer)
         for axiom in axioms:
             ensure_layer_axiom(layer, axiom)
-            grid, ro = data[(layer, axiom)]
-            center = layer
-            N = layer
-
-            # gather ring coords
-            ring_coords = []
-            for y in range(-N, N + 1):
-                for x in range(-N, N + 1):
-                    if max(abs(x), abs(y)) == N:
-                        gx = x + center
-                        gy = y + center
-                        if not ro[gy][gx]:
-                            ring_coords.append((gx, gy))
-
-            total = len(ring_coords)
+            grid, ro = data[axiom][layer]
+            # grids are C-contiguous, so ravel() gives writable flat views
+            cells = grid.ravel()
+
+            # gather writable ring cells
+            writable = ring[~ro.ravel()[ring]]
+
+            total = writable.size
             if total == 0:
                 continue
 
@@ -454,20 +622,18 @@ def prefill_layers(mode, fillA, fillB, fillC, fillD, fillE, fillF, fillH, fillI,
             # apply the prefill mode
             if base_char and base_char != DEFAULT_CHAR:  # skip if empty
                 if mode == 'full':
-                    for (gx, gy) in ring_coords:
-                        grid[gy][gx] = base_char
+                    cells[writable] = base_char
                 elif mode == 'partial':
-                    selected = random.sample(ring_coords, total//2)
-                    for (gx, gy) in selected:
-                        grid[gy][gx] = base_char
+                    idx = rng.choice(total, size=total//2, replace=False)
+                    cells[writable[idx]] = base_char
                 elif mode == 'random':
                     # randomly fill half
-                    selected = random.sample(ring_coords, total//2)
-                    for (gx, gy) in selected:
-                        # pick random from chars_list
-                        ch = random.choice(chars_list).strip()
-                        if ch:
-                            grid[gy][gx] = ch
+                    idx = rng.choice(total, size=total//2, replace=False)
+                    # pick random from chars_list, skipping blank entries
+                    choices = np.array([c.strip() for c in chars_list], dtype='<U1')
+                    picked = rng.choice(choices, size=idx.size)
+                    keep = picked != ''
+                    cells[writable[idx][keep]] = picked[keep]
 
 # ---------------------------------------------------------------------
 # 5) SAVE / LOAD
@@ -479,12 +645,13 @@ def save_game_state(filename):
     """
     with open(filename, 'w', encoding='utf-8') as f:
         # Sort by layer, then axiom
-        for (layer, axiom) in sorted(data.keys(), key=lambda x: (x[0], x[1])):
-            grid, ro = data[(layer, axiom)]
-            dim = layer_dimension(layer)
+        for (layer, axiom, grid, ro) in sorted(iter_layer_axioms(), key=lambda x: (x[0], x[1])):
+            dim = grid.shape[0]
             f.write(f"BEGIN LAYER {layer} AXIOM {axiom} DIM {dim}\n")
+            # '<U1' cells are UCS-4, so whole rows decode without
+            # creating a str object per cell
             for row in grid:
-                f.write("".join(row) + "\n")
+                f.write(row.tobytes().decode('utf-32-le') + "\n")
             f.write("END LAYER\n")
 
 def load_game_state(filename):
@@ -492,7 +659,8 @@ def load_game_state(filename):
     Load from file into `data`, ignoring read-only details initially
     (all become read_only=False).
     """
-    data.clear()
+    for layers in data.values():
+        layers.clear()
     with open(filename, 'r', encoding='utf-8') as f:
         lines = f.readlines()
 
@@ -507,17 +675,18 @@ def load_game_state(filename):
             dim = int(parts[6])
             idx += 1
 
-            new_grid = []
-            for _ in range(dim):
-                row_str = lines[idx].rstrip('\n')
-                new_grid.append(list(row_str))
-                idx += 1
+            # pad/trim every row to dim, then build the grid in one go
+            rows = (line.rstrip('\n')[:dim].ljust(dim, DEFAULT_CHAR)
+                    for line in lines[idx:idx + dim])
+            new_grid = np.frombuffer("".join(rows).encode('utf-32-le'), dtype='<U1')
+            new_grid = new_grid.reshape(dim, dim).copy()
+            idx += dim
 
             # skip "END LAYER"
             idx += 1
 
-            read_only = [[False]*dim for _ in range(dim)]
-            data[(layer, axiom)] = (new_grid, read_only)
+            read_only = np.zeros((dim, dim), dtype=bool)
+            _store_layer_axiom(layer, axiom, new_grid, read_only)
         else:
             idx += 1
 
@@ -527,23 +696,17 @@ def reapply_read_only_inheritance():
     This makes sure that layers 1..N have their inner region marked as read-only,
     matching the normal behavior when building layers from scratch.
     """
-    if not data:
-        return
-    max_layer = max(k[0] for k in data.keys())
-    for layer in range(1, max_layer + 1):
-        for axiom in AXIOM_CONFIGS.keys():
+    for axiom, layers in data.items():
+        for layer in range(1, len(layers)):
             # Only apply if both (layer, axiom) and (layer-1, axiom) exist:
-            if (layer, axiom) in data and (layer - 1, axiom) in data:
-                grid, ro = data[(layer, axiom)]
-                prev_grid, prev_ro = data[(layer - 1, axiom)]
-                prev_dim = layer_dimension(layer - 1)
-                dim = layer_dimension(layer)
+            if layers[layer] is not None and layers[layer - 1] is not None:
+                grid, ro = layers[layer]
+                prev_dim = layers[layer - 1][0].shape[0]
+                dim = grid.shape[0]
                 offset = (dim - prev_dim) // 2
 
                 # Mark that inherited region as read-only:
-                for py in range(prev_dim):
-                    for px in range(prev_dim):
-                        ro[py + offset][px + offset] = True
+                ro[offset:offset + prev_dim, offset:offset + prev_dim] = True
 
 # ---------------------------------------------------------------------
 # 6) CURSES UI
@@ -556,7 +719,25 @@ def run(stdscr):
 
     go_to_layer_axiom(0, 'A')
 
+    renderer = threading.Thread(target=_render_worker, daemon=True)
+    renderer.start()
+    try:
+        _input_loop(stdscr)
+    finally:
+        # blocking put: the stop request must not be dropped
+        _render_requests.put(_STOP_RENDERING)
+        renderer.join()
+
+def _input_loop(stdscr):
+    global _dirty
     while True:
+        if _dirty:
+            # only re-render when data changed, never on plain cursor moves
+            _dirty = False
+            try:
+                _render_requests.put_nowait(True)
+            except queue.Full:
+                pass  # a pending render will pick this change up
         draw_interface(stdscr)
         key = stdscr.getch()
         if key == -1:
@@ -597,30 +778,28 @@ def run(stdscr):
 # ---------------------------------------------------------------------
 if __name__ == "__main__":
     # parse arguments
-    save_file = None
-    load_file = None
-
-    for arg in sys.argv:
-        if arg.startswith('--save='):
-            save_file = arg.split('=')[1]
-        elif arg.startswith('--load='):
-            load_file = arg.split('=')[1]
-        elif arg.startswith('--prefill'):
-            PREFILL = True
-        elif arg.startswith('--mode='):
-            FILL_MODE = arg.split('=')[1]
-        elif arg.startswith('--shape='):
-            SHAPE = arg.split('=')[1]
-        elif arg.startswith('--fill') and '=' in arg:
-            # Something like '--fillA=' or '--fillB='
-            # e.g. '--fillA=A, , ,C'
-            fill_key = arg.split('=')[0][6:]  # everything after '--fill'
-            fill_val_str = arg.split('=')[1]
-            fill_list = fill_val_str.split(',')
-            # Store in FILLS dict if valid
-            if fill_key in FILLS:
-                FILLS[fill_key] = fill_list
-            print(f"DEBUG: fill{fill_key} = {FILLS[fill_key]} (length={len(FILLS[fill_key])})")
+    parser = argparse.ArgumentParser(description="Layered axioms terminal game.")
+    parser.add_argument('--save', metavar='FILENAME', help="save the game state on exit")
+    parser.add_argument('--load', metavar='FILENAME', help="load a saved game state")
+    parser.add_argument('--prefill', action='store_true', help="prefill layers from the fills")
+    parser.add_argument('--mode', default=FILL_MODE, help="prefill mode: full, partial or random")
+    parser.add_argument('--shape', default=SHAPE, help="circle, square or polygon:N")
+    for axiom in FILLS:
+        # e.g. '--fillA=A, , ,C'
+        parser.add_argument(f'--fill{axiom}', metavar='CHARS', type=lambda s: s.split(','),
+                            help=f"comma-separated fill chars for axiom {axiom}, one per layer")
+    args = parser.parse_args()
+
+    save_file = args.save
+    load_file = args.load
+    PREFILL = args.prefill
+    FILL_MODE = args.mode
+    SHAPE = args.shape
+    for axiom in FILLS:
+        fill_list = getattr(args, f'fill{axiom}')
+        if fill_list is not None:
+            FILLS[axiom] = fill_list
+            print(f"DEBUG: fill{axiom} = {FILLS[axiom]} (length={len(FILLS[axiom])})")
 
     # If --load is given, skip prefill
     if load_file and PREFILL: